@@ -1,33 +1,98 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+
+import aiohttp
+import orjson
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
-import importlib
-import sys
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN
 
+LOGGER = logging.getLogger(__name__)
+
 PLATFORMS: list[str] = ["sensor", "binary_sensor"]
 
+
+class ElRinconCoordinator(DataUpdateCoordinator):
+    """Coordinador que consulta la API una vez y comparte el resultado.
+
+    Obtiene /api/today, /api/prev y /api/next y empuja el dict resultante a
+    todas las entidades suscritas, en vez de que cada sensor haga su propia
+    petición.
+    """
+
+    def __init__(self, hass: HomeAssistant, session: aiohttp.ClientSession, host: str, token: str) -> None:
+        super().__init__(hass, LOGGER, name=DOMAIN)
+        self._session = session
+        # URLs y cabeceras construidas una sola vez y reutilizadas por refresco
+        self._headers = {"Authorization": f"Bearer {token}"}
+        self._urls = {
+            "today": f"{host}/api/today",
+            "prev": f"{host}/api/prev",
+            "next": f"{host}/api/next",
+        }
+
+    async def _async_update_data(self) -> dict:
+        prev_data = self.data or {}
+        # Las tres peticiones en paralelo sobre la sesión compartida:
+        # ~1 RTT en vez de 3 en serie
+        today, prev, nxt = await asyncio.gather(
+            self._fetch("today"),
+            self._fetch("prev"),
+            self._fetch("next"),
+        )
+        # Ante un fallo puntual, conservar el último valor conocido
+        return {
+            "today": today if today is not None else prev_data.get("today"),
+            "prev": prev if prev is not None else prev_data.get("prev"),
+            "next": nxt if nxt is not None else prev_data.get("next"),
+        }
+
+    async def _fetch(self, key: str) -> dict | None:
+        url = self._urls[key]
+        try:
+            async with self._session.get(url, headers=self._headers) as resp:
+                if resp.status != 200:
+                    LOGGER.debug("%s responded %s", url, resp.status)
+                    return None
+                return orjson.loads(await resp.read())
+        except Exception as ex:
+            LOGGER.debug("Error fetching %s: %s", url, ex)
+            return None
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up El Rincón de Lola from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    # Hot-reload de módulos de plataformas para recoger cambios sin reiniciar HA
-    for mod_name in (
-        "custom_components.elrincondelola.sensor",
-        "custom_components.elrincondelola.binary_sensor",
-    ):
-        mod = sys.modules.get(mod_name)
-        if mod is not None:
-            try:
-                importlib.reload(mod)
-            except Exception:
-                pass
-
+    # Sesión propia de la integración: keep-alive largo para que la conexión
+    # TLS sobreviva entre ráfagas de eventos SSE separadas por minutos.
+    # Construida directamente porque async_create_clientsession impone su
+    # propio connector y no admite pasar uno
+    session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=300)
+    )
+    coordinator = ElRinconCoordinator(hass, session, entry.data.get("host"), entry.data.get("token"))
     hass.data[DOMAIN][entry.entry_id] = {
         "host": entry.data.get("host"),
         "token": entry.data.get("token"),
+        "session": session,
+        "coordinator": coordinator,
     }
+
+    async def _handle_midnight_tick(now=None) -> None:
+        # Forzar refresco al cambiar el día; un solo temporizador para todas
+        # las entidades
+        await coordinator.async_request_refresh()
+
+    entry.async_on_unload(
+        async_track_time_change(hass, _handle_midnight_tick, hour=0, minute=0, second=0)
+    )
+
+    await coordinator.async_config_entry_first_refresh()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
@@ -35,5 +100,6 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["session"].close()
     return unload_ok
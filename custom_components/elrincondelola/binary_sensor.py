@@ -1,92 +1,67 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from collections.abc import Mapping
+from types import MappingProxyType
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_track_time_change
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, EVENT_SSE_UPDATE
+from .const import DOMAIN
 
 LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     data = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([OcupadoBinarySensor(data["host"], data["token"])])
+    async_add_entities([OcupadoBinarySensor(data["coordinator"])])
 
 
-class OcupadoBinarySensor(BinarySensorEntity):
+class OcupadoBinarySensor(CoordinatorEntity, BinarySensorEntity):
+    __slots__ = ("_is_on", "_attrs", "_attrs_view")
+
     _attr_should_poll = False
 
-    def __init__(self, host: str, token: str) -> None:
-        self._host = host
-        self._token = token
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
         self._attr_name = "Ocupado"
         self._attr_unique_id = "elrincondelola_ocupado"
         self._is_on: bool = False
         self._attrs: dict = {}
-        self._unsubs = []
+        self._attrs_view = MappingProxyType(self._attrs)
 
     @property
     def is_on(self) -> bool:
         return self._is_on
 
     @property
-    def extra_state_attributes(self) -> dict:
-        return self._attrs
+    def extra_state_attributes(self) -> Mapping:
+        # Vista de sólo lectura sobre el dict interno, reutilizada entre escrituras
+        return self._attrs_view
 
     async def async_added_to_hass(self) -> None:
-        # Escuchar eventos SSE de la integración para refrescar estado
-        self._unsubs.append(
-            async_dispatcher_connect(self.hass, EVENT_SSE_UPDATE, self._handle_sse_update)
-        )
-        # Refrescar automáticamente al cambio de día (00:00) igual que "Reserva Hoy"
-        self._unsubs.append(
-            async_track_time_change(self.hass, self._handle_midnight_tick, hour=0, minute=0, second=0)
-        )
-        await self._refresh_from_api()
-
-    async def async_will_remove_from_hass(self) -> None:
-        for unsub in self._unsubs:
-            try:
-                unsub()
-            except Exception:
-                pass
-        self._unsubs = []
-
-    async def _handle_sse_update(self) -> None:
-        await self._refresh_from_api()
-
-    async def _handle_midnight_tick(self, now=None) -> None:
-        # Forzar refresco al cambiar el día
-        await self._refresh_from_api()
+        await super().async_added_to_hass()
+        self._handle_coordinator_update()
 
-    async def _refresh_from_api(self) -> None:
-        url = f"{self._host}/api/today"
-        headers = {"Authorization": f"Bearer {self._token}"}
-        session = async_get_clientsession(self.hass)
-        try:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    LOGGER.debug("/api/today responded %s", resp.status)
-                    return
-                data = await resp.json()
-        except Exception as ex:
-            LOGGER.debug("Error fetching /api/today: %s", ex)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = (self.coordinator.data or {}).get("today")
+        if data is None:
             return
-
-        has_res = bool(data.get("has_reservation", False))
-        self._is_on = has_res
-        self._attrs = {
+        has_res = data.get("has_reservation") or False
+        attrs = {
             "reserva_hoy": has_res,
             "nombre": data.get("user_name"),
-            "cumpleanos": bool(data.get("is_birthday", False)),
-            "festivo": bool(data.get("is_holiday", False)),
+            "cumpleanos": data.get("is_birthday") or False,
+            "festivo": data.get("is_holiday") or False,
             "foto_perfil_url": data.get("profile_pic_url"),
         }
+        # Evitar escrituras de estado sin cambios
+        if has_res == self._is_on and attrs == self._attrs:
+            return
+        self._is_on = has_res
+        self._attrs.clear()
+        self._attrs.update(attrs)
         self.async_write_ha_state()
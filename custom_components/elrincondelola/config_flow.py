@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-import re
-import aiohttp
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from typing import Any
 from homeassistant.core import HomeAssistant
 
@@ -43,27 +42,40 @@ class ElRinconLolaConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def _login_and_get_token(self, host: str, username: str, password: str) -> str:
         login_url = f"{host}/login"
         token_url = f"{host}/oauth/token"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(login_url) as resp:
-                text = await resp.text()
-            match = re.search(r'name="csrf_token"[^>]*value="([^"]+)"', text)
-            if not match:
-                raise RuntimeError("CSRF token not found")
-            csrf = match.group(1)
-            payload = {
-                "csrf_token": csrf,
-                "email_or_username": username,
-                "password": password,
-                "remember": "y",
-            }
-            async with session.post(login_url, data=payload) as resp:
-                if resp.status not in (200, 302):
-                    raise RuntimeError("Login failed")
-            async with session.post(token_url) as resp:
-                if resp.status != 200:
-                    raise RuntimeError("Token request failed")
-                data = await resp.json()
-            return data["access_token"]
+        # Reutilizar la sesión compartida de HA: las tres peticiones comparten
+        # una misma conexión keep-alive en vez de pagar TCP+TLS cada vez
+        session = async_get_clientsession(self.hass)
+        async with session.get(login_url) as resp:
+            body = await resp.read()
+        # Búsqueda lineal sobre los bytes crudos: un solo paso sobre el HTML
+        # y sin decodificar la página entera, sólo el token
+        i = body.find(b'name="csrf_token"')
+        if i < 0:
+            raise RuntimeError("CSRF token not found")
+        # Limitar la búsqueda al propio <input>, como hacía [^>]* en el regex
+        tag_end = body.find(b">", i)
+        j = body.find(b'value="', i, tag_end if tag_end >= 0 else None)
+        if j < 0:
+            raise RuntimeError("CSRF token not found")
+        j += 7
+        k = body.find(b'"', j)
+        if k < 0:
+            raise RuntimeError("CSRF token not found")
+        csrf = body[j:k].decode()
+        payload = {
+            "csrf_token": csrf,
+            "email_or_username": username,
+            "password": password,
+            "remember": "y",
+        }
+        async with session.post(login_url, data=payload) as resp:
+            if resp.status not in (200, 302):
+                raise RuntimeError("Login failed")
+        async with session.post(token_url) as resp:
+            if resp.status != 200:
+                raise RuntimeError("Token request failed")
+            data = await resp.json()
+        return data["access_token"]
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
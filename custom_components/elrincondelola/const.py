@@ -2,4 +2,3 @@ DOMAIN = "elrincondelola"
 CONF_HOST = "host"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
-EVENT_SSE_UPDATE = "elrincondelola_sse_update"
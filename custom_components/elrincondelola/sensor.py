@@ -2,37 +2,42 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections.abc import Mapping
 from contextlib import suppress
+from types import MappingProxyType
 from typing import Optional
 
 import aiohttp
+import orjson
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from homeassistant.helpers.dispatcher import async_dispatcher_send, async_dispatcher_connect
-
-from .const import DOMAIN, EVENT_SSE_UPDATE
+from .const import DOMAIN
 
 LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     data = hass.data[DOMAIN][entry.entry_id]
-    host = data["host"]
-    token = data["token"]
-    entities = [ApiPingSensor(host, token), ReservaHoySensor(host, token), ReservaAnteriorSensor(host, token), ReservaProximaSensor(host, token)]
+    coordinator = data["coordinator"]
+    entities = [ApiPingSensor(data["host"], data["token"], data["session"], coordinator), ReservaHoySensor(coordinator), ReservaAnteriorSensor(coordinator), ReservaProximaSensor(coordinator)]
     async_add_entities(entities)
 
 
 class ApiPingSensor(SensorEntity):
     """Sensor that reflects last event from SSE stream."""
 
-    def __init__(self, host: str, token: str) -> None:
+    # Sin nombres _attr_*: en HA recientes son propiedades de clase que
+    # invalidan cachés al escribir, y un slot las eclipsaría
+    __slots__ = ("_host", "_token", "_session", "_coordinator", "_task", "_running")
+
+    def __init__(self, host: str, token: str, session: aiohttp.ClientSession, coordinator) -> None:
         self._host = host
         self._token = token
+        self._session = session
+        self._coordinator = coordinator
         self._attr_name = "El Rincón de Lola API"
         self._attr_unique_id = "elrincondelola_api"
         self._attr_native_value: Optional[str] = None
@@ -58,7 +63,7 @@ class ApiPingSensor(SensorEntity):
 
         Implements backoff reconnection and ignores keep-alive pings.
         """
-        session = async_get_clientsession(self.hass)
+        session = self._session
         url = f"{self._host}/api/events"
         headers = {
             "Authorization": f"Bearer {self._token}",
@@ -83,29 +88,49 @@ class ApiPingSensor(SensorEntity):
                     # Conectado correctamente; seguir esperando eventos
                     backoff = 5
 
-                    buffer = ""
-                    async for raw in resp.content:
-                        if not self._running:
+                    # Trabajar en bytes: los keep-alives no se decodifican y el
+                    # evento se acumula en un bytearray (crecimiento amortizado)
+                    buf = bytearray()
+                    # readline() garantiza exactamente una línea por iteración;
+                    # la iteración por chunks puede pegar o partir líneas
+                    while self._running:
+                        raw = await resp.content.readline()
+                        if not raw:
                             break
-                        try:
-                            line = raw.decode("utf-8").rstrip("\n")
-                        except Exception:
-                            continue
+                        line = raw.rstrip(b"\r\n")
 
                         if not line:
-                            if buffer:
-                                LOGGER.debug("SSE event assembled: %s", buffer)
-                                self._attr_native_value = buffer
-                                buffer = ""
+                            if buf:
+                                # Decodificar una sola vez por evento completo
+                                try:
+                                    event = buf.decode("utf-8")
+                                except UnicodeDecodeError:
+                                    buf.clear()
+                                    continue
+                                LOGGER.debug("SSE event assembled: %s", event)
+                                self._attr_native_value = event
+                                buf.clear()
                                 self.async_write_ha_state()
-                                # Notificar a otras entidades de la integración
-                                async_dispatcher_send(self.hass, EVENT_SSE_UPDATE)
+                                try:
+                                    payload = orjson.loads(event)
+                                except orjson.JSONDecodeError:
+                                    payload = None
+                                if isinstance(payload, dict) and "has_reservation" in payload:
+                                    # El evento ya trae los datos de hoy:
+                                    # empujarlos al coordinador, que invoca sus
+                                    # listeners en línea sin crear tareas
+                                    self._coordinator.async_set_updated_data(
+                                        {**(self._coordinator.data or {}), "today": payload}
+                                    )
+                                # Refrescar igualmente (con debounce): el evento
+                                # puede afectar también a /api/prev y /api/next
+                                await self._coordinator.async_request_refresh()
                             continue
-                        if line.startswith(":"):
+                        if line[0] == 0x3A:  # b":"
                             # Comment/keep-alive (e.g., ": ping")
                             continue
-                        if line.startswith("data:"):
-                            buffer += line[5:].lstrip()
+                        if line[:5] == b"data:":
+                            buf += line[5:].lstrip()
                             continue
                         # Ignore other fields (event:, id:)
 
@@ -118,160 +143,113 @@ class ApiPingSensor(SensorEntity):
                 backoff = min(backoff * 2, 300)
 
 
-class ReservaHoySensor(SensorEntity):
+class ReservaHoySensor(CoordinatorEntity, SensorEntity):
     """Sensor que indica si hay reserva hoy y sus atributos."""
 
+    __slots__ = ("_attrs", "_attrs_view")
+
     _attr_should_poll = False
 
-    def __init__(self, host: str, token: str) -> None:
-        self._host = host
-        self._token = token
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
         self._attr_name = "Reserva Hoy"
         self._attr_unique_id = "elrincondelola_reserva_hoy"
         self._attr_native_value: Optional[str] = None
         self._attrs: dict = {}
-        self._unsubs = []
+        self._attrs_view = MappingProxyType(self._attrs)
 
     @property
-    def extra_state_attributes(self) -> dict:
-        return self._attrs
+    def extra_state_attributes(self) -> Mapping:
+        # Vista de sólo lectura sobre el dict interno, reutilizada entre escrituras
+        return self._attrs_view
 
     async def async_added_to_hass(self) -> None:
-        # Suscribirse a eventos SSE de la misma integración para refrescar
-        self._unsubs.append(
-            async_dispatcher_connect(self.hass, EVENT_SSE_UPDATE, self._handle_sse_update)
-        )
-        # También refrescar automáticamente al cambio de día local (00:00)
-        self._unsubs.append(
-            async_track_time_change(self.hass, self._handle_midnight_tick, hour=0, minute=0, second=0)
-        )
-        # Inicial: cargar estado de la API
-        await self._refresh_from_api()
-        # Sin polling nocturno: refrescamos sólo por eventos SSE
-
-    async def async_will_remove_from_hass(self) -> None:
-        # Cancelar todas las suscripciones
-        for unsub in self._unsubs:
-            try:
-                unsub()
-            except Exception:
-                pass
-        self._unsubs = []
-
-    async def _handle_sse_update(self) -> None:
-        await self._refresh_from_api()
-
-    async def _handle_midnight_tick(self, now=None) -> None:
-        # Forzar refresco al cambiar el día
-        await self._refresh_from_api()
-
-    async def _refresh_from_api(self) -> None:
-        url = f"{self._host}/api/today"
-        headers = {"Authorization": f"Bearer {self._token}"}
-        session = async_get_clientsession(self.hass)
-        try:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    LOGGER.debug("/api/today responded %s", resp.status)
-                    return
-                data = await resp.json()
-        except Exception as ex:
-            LOGGER.debug("Error fetching /api/today: %s", ex)
+        await super().async_added_to_hass()
+        # Inicial: aplicar los datos ya cargados por el coordinador
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = (self.coordinator.data or {}).get("today")
+        if data is None:
             return
-
         has_res = data.get("has_reservation")
         if has_res:
-            name = data.get("user_name") or "Desconocido"
-            self._attr_native_value = name
+            native = data.get("user_name") or "Desconocido"
         else:
-            self._attr_native_value = "Libre"
-        self._attrs = {
-            "cumpleanos": bool(data.get("is_birthday", False)),
-            "festivo": bool(data.get("is_holiday", False)),
+            native = "Libre"
+        attrs = {
+            "cumpleanos": data.get("is_birthday") or False,
+            "festivo": data.get("is_holiday") or False,
             "foto_perfil_url": data.get("profile_pic_url"),
         }
+        # Evitar escrituras de estado sin cambios: cada state_changed se
+        # propaga a recorder, historial y websockets
+        if native == self._attr_native_value and attrs == self._attrs:
+            return
+        self._attr_native_value = native
+        self._attrs.clear()
+        self._attrs.update(attrs)
         self.async_write_ha_state()
 
 
-class _ReservaBase(SensorEntity):
+class _ReservaBase(CoordinatorEntity, SensorEntity):
+    __slots__ = ("_attrs", "_attrs_view", "_key")
+
     _attr_should_poll = False
 
-    def __init__(self, host: str, token: str, name: str, unique_id: str, endpoint: str) -> None:
-        self._host = host
-        self._token = token
+    def __init__(self, coordinator, name: str, unique_id: str, key: str) -> None:
+        super().__init__(coordinator)
         self._attr_name = name
         self._attr_unique_id = unique_id
         self._attr_native_value: Optional[str] = None
         self._attrs: dict = {}
-        self._endpoint = endpoint
-        self._unsubs = []
+        self._attrs_view = MappingProxyType(self._attrs)
+        self._key = key
 
     @property
-    def extra_state_attributes(self) -> dict:
-        return self._attrs
+    def extra_state_attributes(self) -> Mapping:
+        # Vista de sólo lectura sobre el dict interno, reutilizada entre escrituras
+        return self._attrs_view
 
     async def async_added_to_hass(self) -> None:
-        self._unsubs.append(
-            async_dispatcher_connect(self.hass, EVENT_SSE_UPDATE, self._handle_sse_update)
-        )
-        # Refrescar al cambio de día local (00:00)
-        self._unsubs.append(
-            async_track_time_change(self.hass, self._handle_midnight_tick, hour=0, minute=0, second=0)
-        )
-        await self._refresh_from_api()
+        await super().async_added_to_hass()
+        self._handle_coordinator_update()
 
-    async def async_will_remove_from_hass(self) -> None:
-        for unsub in self._unsubs:
-            try:
-                unsub()
-            except Exception:
-                pass
-        self._unsubs = []
-
-    async def _handle_sse_update(self) -> None:
-        await self._refresh_from_api()
-
-    async def _handle_midnight_tick(self, now=None) -> None:
-        # Forzar refresco al cambiar el día
-        await self._refresh_from_api()
-
-    async def _refresh_from_api(self) -> None:
-        url = f"{self._host}{self._endpoint}"
-        headers = {"Authorization": f"Bearer {self._token}"}
-        session = async_get_clientsession(self.hass)
-        try:
-            async with session.get(url, headers=headers) as resp:
-                if resp.status != 200:
-                    LOGGER.debug("%s responded %s", self._endpoint, resp.status)
-                    return
-                data = await resp.json()
-        except Exception as ex:
-            LOGGER.debug("Error fetching %s: %s", self._endpoint, ex)
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        data = (self.coordinator.data or {}).get(self._key)
+        if data is None:
             return
-
         if data.get("has_reservation"):
             # Estado = nombre; fecha va como atributo
-            self._attr_native_value = data.get("user_name") or data.get("date") or "Desconocido"
+            native = data.get("user_name") or data.get("date") or "Desconocido"
         else:
-            self._attr_native_value = "Ninguna"
-        self._attrs = {
+            native = "Ninguna"
+        attrs = {
             "nombre": data.get("user_name"),
-            "cumpleanos": bool(data.get("is_birthday", False)),
-            "festivo": bool(data.get("is_holiday", False)),
+            "cumpleanos": data.get("is_birthday") or False,
+            "festivo": data.get("is_holiday") or False,
             "foto_perfil_url": data.get("profile_pic_url"),
             "fecha": data.get("date"),
         }
+        # Evitar escrituras de estado sin cambios
+        if native == self._attr_native_value and attrs == self._attrs:
+            return
+        self._attr_native_value = native
+        self._attrs.clear()
+        self._attrs.update(attrs)
         self.async_write_ha_state()
 
 
 class ReservaAnteriorSensor(_ReservaBase):
-    def __init__(self, host: str, token: str) -> None:
-        super().__init__(host, token, "Anterior Reserva", "elrincondelola_reserva_anterior", "/api/prev")
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator, "Anterior Reserva", "elrincondelola_reserva_anterior", "prev")
 
 
 class ReservaProximaSensor(_ReservaBase):
-    def __init__(self, host: str, token: str) -> None:
-        super().__init__(host, token, "Próxima Reserva", "elrincondelola_reserva_proxima", "/api/next")
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator, "Próxima Reserva", "elrincondelola_reserva_proxima", "next")
 
     # Keep async_update for compatibility; no-op since push-based
     async def async_update(self) -> None:  # noqa: D401